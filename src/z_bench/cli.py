@@ -49,6 +49,10 @@ Examples:
                            help='Size per file (e.g., 10MB)')
     gen_parser.add_argument('--total-size', required=True,
                            help='Total dataset size (e.g., 1GB)')
+    gen_parser.add_argument('--content-mode', choices=['shared', 'unique'], default='shared',
+                           help='Identical bytes in every file, or unique bytes per file')
+    gen_parser.add_argument('--verify', action='store_true',
+                           help='Check the size of every generated file')
     
     # Benchmark mode
     bench_parser = subparsers.add_parser('benchmark', help='Run benchmark operations')
@@ -63,13 +67,22 @@ Examples:
         parser_obj.add_argument('--get-cmd', help='GET command template')
         parser_obj.add_argument('--del-cmd', help='DELETE command template')
         parser_obj.add_argument('--out', type=Path, default='results.csv',
-                               help='Output file (CSV or JSONL)')
+                               help='Output file (CSV, JSONL or Parquet)')
         parser_obj.add_argument('--warmup', type=int, default=3,
                                help='Number of warm-up operations per type')
         parser_obj.add_argument('--wait', type=int, default=5,
                                help='Wait time between phases (seconds)')
         parser_obj.add_argument('--no-log', action='store_true',
                                help='Disable logging for ultra-low-overhead timing')
+        parser_obj.add_argument('--use-sdk', action='store_true',
+                               help='Run aws s3 cp/rm templates through an in-process boto3 client')
+        parser_obj.add_argument('--io-backend', choices=['subprocess', 'native'], default='subprocess',
+                               help='Run plain cp/rm templates in-process and s5cmd cp/mv/rm templates '
+                                    'through persistent s5cmd processes (native)')
+        parser_obj.add_argument('--concurrency', type=int, default=16,
+                               help='Number of operations in flight per phase')
+        parser_obj.add_argument('--fail-fast', action='store_true',
+                               help='Abort a phase on the first failed operation')
     parser.add_argument('--reuse-files', action='store_true',
                        help='Skip file generation if files exist (--ALL mode)')
     
@@ -82,6 +95,10 @@ Examples:
                        help='Size per file (--ALL mode)')
     parser.add_argument('--total-size',
                        help='Total dataset size (--ALL mode)')
+    parser.add_argument('--content-mode', choices=['shared', 'unique'], default='shared',
+                       help='Identical bytes in every file, or unique bytes per file (--ALL mode)')
+    parser.add_argument('--verify', action='store_true',
+                       help='Check the size of every generated file (--ALL mode)')
     
     args = parser.parse_args()
     
@@ -100,11 +117,18 @@ def create_config(args: argparse.Namespace) -> BenchmarkConfig:
     config.output_dir = args.output_dir
     config.file_size = args.file_size
     config.total_size = args.total_size
+    config.parse_sizes()
     config.warmup = args.warmup
     config.wait = args.wait
     config.out_file = args.out
     config.no_log = args.no_log
     config.reuse_files = args.reuse_files
+    config.use_sdk = args.use_sdk
+    config.concurrency = args.concurrency
+    config.fail_fast = args.fail_fast
+    config.io_backend = args.io_backend
+    config.content_mode = args.content_mode
+    config.verify = args.verify
     
     # Command templates
     config.put_cmd = args.put_cmd
@@ -125,9 +149,11 @@ def main() -> None:
     validate_python_version()
     
     args = parse_arguments()
-    config = create_config(args)
+    
+    benchmarker: Optional[ZBenchmarker] = None
     
     try:
+        config = create_config(args)
         benchmarker = ZBenchmarker(config)
         
         if args.ALL:
@@ -137,12 +163,19 @@ def main() -> None:
         elif args.mode == 'benchmark':
             benchmarker.run_benchmark(args.op)
         
+        # Failures are summarized per phase rather than aborting it
+        if benchmarker.benchmark_runner.failures:
+            sys.exit(1)
+        
     except KeyboardInterrupt:
         print("\nBenchmark interrupted by user", file=sys.stderr)
         sys.exit(1)
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
+    finally:
+        if benchmarker:
+            benchmarker.close()
 
 
 if __name__ == '__main__':
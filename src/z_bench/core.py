@@ -1,16 +1,103 @@
 """Core benchmarking functionality."""
 
-import csv
+import errno
 import json
+import multiprocessing
 import os
+import queue
 import random
+import re
+import selectors
+import shlex
 import shutil
 import statistics
 import subprocess
 import sys
+import threading
 import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List, Optional, Union, Tuple
+from typing import IO, Any, Callable, Deque, Dict, List, NamedTuple, Optional, Union, Tuple
+
+# Largest random block kept in memory and reused while writing test files
+TEMPLATE_SIZE = 4 * 1024 * 1024
+
+# A benchmark input file as (path, filename, size in bytes), resolved once up front
+FileEntry = Tuple[str, str, int]
+
+
+
+class Result(NamedTuple):
+    """A single logged operation; field order is the output column order."""
+    
+    timestamp_ns: int
+    operation: str
+    filename: str
+    size_bytes: int
+    latency_ns: int
+    status: str
+    error: str
+    warmup: bool
+    submit_ns: int
+    complete_ns: int
+
+
+FIELDS = list(Result._fields)
+
+# Shared string constants for result fields, interned once rather than built per operation
+OPERATION_NAMES = {op: sys.intern(op.upper()) for op in ('put', 'get', 'delete')}
+STATUS_SUCCESS = sys.intern('success')
+STATUS_FAIL = sys.intern('fail')
+
+# Pre-built CSV header and row format (same dialect as csv.writer: CRLF, minimal quoting)
+CSV_HEADER = ','.join(FIELDS) + '\r\n'
+CSV_ROW = ','.join(['{}'] * len(FIELDS)) + '\r\n'
+CSV_SPECIAL = re.compile(r'[,"\r\n]')
+
+# Placeholders substituted into command templates
+PLACEHOLDER = re.compile(r'\{(file|filename)\}')
+
+# Characters that need a real shell to interpret the command template
+SHELL_METACHARS = re.compile(r'[|&;<>()$`\\"\'*?\[\]#~{}\n]')
+
+# Size strings such as '10MB' or '1.5 GB': a number and an optional unit suffix
+SIZE_PATTERN = re.compile(r'([\d.E+\-_\s]*?)(TB|GB|MB|KB|B)?')
+SIZE_UNITS = {'B': 1, 'KB': 1024, 'MB': 1024**2, 'GB': 1024**3, 'TB': 1024**4}
+
+# Rows per Parquet record batch; each flush becomes at least one row group
+PARQUET_BATCH_ROWS = 100_000
+
+# Maximum number of buffers accepted by a single pwritev() call
+IOV_MAX = os.sysconf('SC_IOV_MAX') if hasattr(os, 'sysconf') else 1024
+
+try:
+    import boto3
+    from boto3.exceptions import Boto3Error
+    from botocore.config import Config as BotoConfig
+    from botocore.exceptions import BotoCoreError, ClientError
+    HAS_BOTO3 = True
+except ImportError:  # Optional dependency, only needed for --use-sdk
+    HAS_BOTO3 = False
+
+try:
+    from numpy.random import default_rng
+    HAS_NUMPY = True
+except ImportError:  # Optional dependency, the stdlib generator is used instead
+    HAS_NUMPY = False
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:  # Optional dependency, stdlib json is used instead
+    HAS_ORJSON = False
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:  # Optional dependency, only needed for .parquet output
+    HAS_PYARROW = False
 
 
 class BenchmarkConfig:
@@ -21,16 +108,223 @@ class BenchmarkConfig:
         self.input_dir: Optional[Path] = None
         self.file_size: Optional[str] = None
         self.total_size: Optional[str] = None
+        self.file_size_bytes: Optional[int] = None
+        self.total_size_bytes: Optional[int] = None
         self.warmup: int = 3
         self.wait: int = 5
         self.out_file: Optional[Path] = None
         self.no_log: bool = False
         self.reuse_files: bool = False
+        self.use_sdk: bool = False
+        self.concurrency: int = 16
+        self.fail_fast: bool = False
+        self.io_backend: str = 'subprocess'
+        self.content_mode: str = 'shared'
+        self.verify: bool = False
         
         # Command templates
         self.put_cmd: Optional[str] = None
         self.get_cmd: Optional[str] = None
         self.del_cmd: Optional[str] = None
+    
+    def parse_sizes(self) -> None:
+        """Resolve the file and total size strings to byte counts."""
+        if self.file_size:
+            self.file_size_bytes = self.parse_size(self.file_size)
+        if self.total_size:
+            self.total_size_bytes = self.parse_size(self.total_size)
+    
+    @staticmethod
+    def parse_size(size_str: str) -> int:
+        """Parse size string (e.g., '10MB', '1GB') to bytes."""
+        size_str = size_str.upper().strip()
+        match = SIZE_PATTERN.fullmatch(size_str)
+        if match is None:
+            raise ValueError(f"Invalid size format: {size_str}")
+        
+        # Sizes with a unit may be fractional (1.5GB); plain byte counts may not
+        number, unit = match.groups()
+        try:
+            if unit:
+                return int(float(number.strip()) * SIZE_UNITS[unit])
+            return int(number)
+        except ValueError:
+            raise ValueError(f"Invalid size format: {size_str}")
+
+
+def compile_template(template: str) -> Callable[[str, str], str]:
+    """Compile a command template into a function of (file path, filename)."""
+    # Split yields literal, placeholder name, literal, ... so literals are even indices
+    parts = PLACEHOLDER.split(template)
+    
+    if len(parts) == 1:
+        return lambda path, filename: template
+    
+    if len(parts) == 3:
+        prefix, name, suffix = parts
+        if name == 'file':
+            return lambda path, filename: prefix + path + suffix
+        return lambda path, filename: prefix + filename + suffix
+    
+    literals = parts[0::2]
+    names = parts[1::2]
+    
+    def build(path: str, filename: str) -> str:
+        pieces = [literals[0]]
+        for name, literal in zip(names, literals[1:]):
+            pieces.append(path if name == 'file' else filename)
+            pieces.append(literal)
+        return ''.join(pieces)
+    
+    return build
+
+
+class _GeneratorState:
+    """Per-process state for file generation workers, set by _init_generator_worker."""
+    
+    def __init__(self) -> None:
+        self.output_dir: str = ''
+        self.file_size_bytes: int = 0
+        # Template buffers in shared mode; None when each file gets unique content
+        self.buffers: Optional[List[memoryview]] = None
+        self.template_fd: Optional[int] = None
+
+
+_generator_state = _GeneratorState()
+
+
+def _init_generator_worker(output_dir: str, file_size_bytes: int, template: Optional[bytes],
+                           template_path: Optional[str], cores: List[int],
+                           next_core: Optional[Any]) -> None:
+    """Prepare a generation worker: pin it to a core and set up its content source."""
+    if cores and next_core is not None and hasattr(os, 'sched_setaffinity'):
+        with next_core.get_lock():
+            slot = next_core.value
+            next_core.value += 1
+        os.sched_setaffinity(0, {cores[slot % len(cores)]})
+    
+    # Shared content is written from one template block; unique content has none
+    buffers = None
+    if template is not None:
+        view = memoryview(template)
+        full_chunks, tail_size = divmod(file_size_bytes, len(view))
+        buffers = [view] * full_chunks
+        if tail_size:
+            buffers.append(view[:tail_size])
+    
+    # An already written template file lets the kernel copy the rest fd-to-fd
+    template_fd = None
+    if template_path is not None and hasattr(os, 'sendfile'):
+        template_fd = os.open(template_path, os.O_RDONLY | getattr(os, 'O_CLOEXEC', 0)
+                              | getattr(os, 'O_BINARY', 0))
+    
+    _generator_state.output_dir = output_dir
+    _generator_state.file_size_bytes = file_size_bytes
+    _generator_state.buffers = buffers
+    _generator_state.template_fd = template_fd
+
+
+def _reset_generator_worker() -> None:
+    """Release in-process generation state after a serial run."""
+    global _generator_state
+    if _generator_state.template_fd is not None:
+        os.close(_generator_state.template_fd)
+    _generator_state = _GeneratorState()
+
+
+def _generate_one(index: int) -> str:
+    """Write one test file from the worker's content source and return its name."""
+    filename = f"file_{index+1:04d}.bin"
+    file_size_bytes = _generator_state.file_size_bytes
+    flags = (os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+             | getattr(os, 'O_CLOEXEC', 0) | getattr(os, 'O_BINARY', 0))
+    
+    fd = os.open(os.path.join(_generator_state.output_dir, filename), flags, 0o644)
+    try:
+        # Reserve the extents up front so the filesystem allocates once
+        if hasattr(os, 'posix_fallocate'):
+            try:
+                os.posix_fallocate(fd, 0, file_size_bytes)
+            except OSError:
+                pass  # Not supported by every filesystem; only an optimization
+        
+        buffers = _generator_state.buffers
+        if buffers is None:
+            _write_unique(fd, index, file_size_bytes)
+        elif not _send_template(fd, file_size_bytes):
+            _write_buffers(fd, buffers)
+        getattr(os, 'fdatasync', os.fsync)(fd)
+    finally:
+        os.close(fd)
+    
+    return filename
+
+
+def _send_template(fd: int, size: int) -> bool:
+    """Copy the template file into fd inside the kernel; False if unavailable."""
+    template_fd = _generator_state.template_fd
+    if template_fd is None:
+        return False
+    
+    offset = 0
+    while offset < size:
+        try:
+            sent = os.sendfile(fd, template_fd, offset, size - offset)
+        except OSError:
+            if offset:
+                raise
+            # Platforms that only sendfile to sockets; stop trying in this worker
+            os.close(template_fd)
+            _generator_state.template_fd = None
+            return False
+        if sent == 0:
+            raise RuntimeError(f"Template file is shorter than {size:,} bytes")
+        offset += sent
+    return True
+
+
+def _random_source(seed: List[int]) -> Callable[[int], bytes]:
+    """Return a seeded random byte source, numpy's PCG64 when available."""
+    if HAS_NUMPY:
+        draw: Callable[[int], bytes] = default_rng(seed).bytes
+        return draw
+    # String seeds are hashed deterministically, independent of PYTHONHASHSEED
+    return random.Random('-'.join(map(str, seed))).randbytes
+
+
+def _write_unique(fd: int, index: int, size: int) -> None:
+    """Write per-file random content, seeded by file index."""
+    draw = _random_source([42, index])
+    offset = 0
+    while offset < size:
+        count = min(TEMPLATE_SIZE, size - offset)
+        chunk = draw(count)
+        _write_buffers(fd, [memoryview(chunk)], offset)
+        offset += count
+
+
+def _write_buffers(fd: int, buffers: List[memoryview], offset: int = 0) -> None:
+    """Write buffers to a file at offset, retrying on short writes."""
+    if not hasattr(os, 'pwritev'):
+        os.lseek(fd, offset, os.SEEK_SET)
+        for view in buffers:
+            while view:
+                view = view[os.write(fd, view):]
+        return
+    
+    pending = list(buffers)
+    while pending:
+        written = os.pwritev(fd, pending[:IOV_MAX], offset)
+        offset += written
+        
+        # Drop fully written buffers and trim the partially written one
+        done = 0
+        while done < len(pending) and written >= len(pending[done]):
+            written -= len(pending[done])
+            done += 1
+        pending = pending[done:]
+        if written:
+            pending[0] = pending[0][written:]
 
 
 class FileGenerator:
@@ -38,27 +332,17 @@ class FileGenerator:
     
     def __init__(self, config: BenchmarkConfig) -> None:
         self.config = config
+        
+        # Seeded generator keeps file contents reproducible across runs
+        self._random_bytes = _random_source([42])
+    
+    def random_bytes(self, size: int) -> bytes:
+        """Return seeded random bytes, from numpy's PCG64 generator when available."""
+        return self._random_bytes(size)
     
     def parse_size(self, size_str: str) -> int:
         """Parse size string (e.g., '10MB', '1GB') to bytes."""
-        size_str = size_str.upper().strip()
-        
-        # Define units in order of length (longest first to avoid partial matches)
-        units = [('TB', 1024**4), ('GB', 1024**3), ('MB', 1024**2), ('KB', 1024), ('B', 1)]
-        
-        for unit, multiplier in units:
-            if size_str.endswith(unit):
-                number_part = size_str[:-len(unit)].strip()
-                try:
-                    return int(float(number_part) * multiplier)
-                except ValueError:
-                    raise ValueError(f"Invalid size format: {size_str}")
-        
-        # Try parsing as plain number (bytes)
-        try:
-            return int(size_str)
-        except ValueError:
-            raise ValueError(f"Invalid size format: {size_str}")
+        return BenchmarkConfig.parse_size(size_str)
     
     def validate_disk_space(self, required_bytes: int) -> bool:
         """Validate available disk space before generation."""
@@ -75,13 +359,17 @@ class FileGenerator:
         return True
     
     def generate_files(self) -> List[Path]:
-        """Generate reproducible random binary files."""
+        """Generate random binary files."""
         if not self.config.output_dir or not self.config.file_size or not self.config.total_size:
             raise ValueError("Missing required parameters for file generation")
         
-        # Parse sizes
-        file_size_bytes = self.parse_size(self.config.file_size)
-        total_size_bytes = self.parse_size(self.config.total_size)
+        # Sizes are normally parsed once by create_config
+        if self.config.file_size_bytes is None or self.config.total_size_bytes is None:
+            self.config.parse_sizes()
+        file_size_bytes = self.config.file_size_bytes
+        total_size_bytes = self.config.total_size_bytes
+        if file_size_bytes is None or total_size_bytes is None:
+            raise ValueError("Missing required parameters for file generation")
         
         # Calculate number of files
         num_files = total_size_bytes // file_size_bytes
@@ -95,136 +383,605 @@ class FileGenerator:
         # Create output directory
         self.config.output_dir.mkdir(parents=True, exist_ok=True)
         
-        # Generate files with fixed seed for reproducibility
-        random.seed(42)
-        generated_files = []
+        content_mode = self.config.content_mode
+        if content_mode not in ('shared', 'unique'):
+            raise ValueError(f"Unknown content mode: {content_mode}")
         
-        print(f"Generating {num_files} files of {file_size_bytes:,} bytes each...")
+        # Contents are opaque to the object store, so in shared mode a single
+        # random block is generated once and every file carries the same bytes
+        template = None
+        if content_mode == 'shared':
+            template = self.random_bytes(min(file_size_bytes, TEMPLATE_SIZE))
         
-        for i in range(num_files):
-            filename = f"file_{i+1:04d}.bin"
-            filepath = self.config.output_dir / filename
-            
-            # Generate random binary data
-            with open(filepath, 'wb') as f:
-                remaining = file_size_bytes
-                chunk_size = min(1024 * 1024, remaining)  # 1MB chunks
-                
-                while remaining > 0:
-                    chunk_size = min(chunk_size, remaining)
-                    data = random.randbytes(chunk_size)
-                    f.write(data)
-                    remaining -= chunk_size
+        # One writer process per available core; files are independent
+        if hasattr(os, 'sched_getaffinity'):
+            cores = sorted(os.sched_getaffinity(0))
+        else:
+            cores = list(range(os.cpu_count() or 1))
+        workers = min(len(cores), num_files)
+        
+        print(f"Generating {num_files} files of {file_size_bytes:,} bytes each "
+              f"({workers} writers, {content_mode} content)...")
+        if content_mode == 'shared':
+            # Larger files repeat the template block, so even one file alone is redundant
+            detail = "all files have identical content"
+            if file_size_bytes > TEMPLATE_SIZE:
+                detail += f" and each repeats one {TEMPLATE_SIZE // (1024 * 1024)}MB block"
+            print(f"Warning: {detail}, which some storage backends deduplicate or compress; "
+                  "use --content-mode unique to avoid this", file=sys.stderr)
+        
+        output_dir = str(self.config.output_dir)
+        names: List[str] = []
+        indices = range(num_files)
+        template_path = None
+        if content_mode == 'shared':
+            # The first file becomes the template the others are sendfile()d from
+            _init_generator_worker(output_dir, file_size_bytes, template, None, [], None)
+            names.append(_generate_one(0))
+            _reset_generator_worker()
+            template_path = os.path.join(output_dir, names[0])
+            indices = range(1, num_files)
+        
+        if workers <= 1 or len(indices) <= 1:
+            _init_generator_worker(output_dir, file_size_bytes, template, template_path, [], None)
+            try:
+                names.extend(_generate_one(i) for i in indices)
+            finally:
+                _reset_generator_worker()
+        else:
+            # Fork shares the template with workers instead of pickling it
+            if sys.platform.startswith('linux'):
+                mp_context = multiprocessing.get_context('fork')
+            else:
+                mp_context = multiprocessing.get_context()
+            next_core = mp_context.Value('i', 0)
             
-            generated_files.append(filepath)
+            with ProcessPoolExecutor(
+                max_workers=min(workers, len(indices)), mp_context=mp_context,
+                initializer=_init_generator_worker,
+                initargs=(output_dir, file_size_bytes, template, template_path, cores, next_core),
+            ) as executor:
+                names.extend(executor.map(_generate_one, indices,
+                                          chunksize=max(1, len(indices) // (workers * 4))))
+        
+        generated_files = [self.config.output_dir / name for name in names]
+        actual_total = file_size_bytes * len(generated_files)
+        
+        # Optional check that every file landed at its full size
+        if self.config.verify:
+            short = [name for name in names
+                     if os.stat(os.path.join(output_dir, name), follow_symlinks=False).st_size
+                     != file_size_bytes]
+            if short:
+                raise RuntimeError(f"{len(short)} generated files have the wrong size, "
+                                   f"e.g. {short[0]}")
         
         # Log generation summary
-        actual_total = sum(f.stat().st_size for f in generated_files)
         print(f"Generated {len(generated_files)} files, total size: {actual_total:,} bytes")
         
         return generated_files
 
 
-class BenchmarkRunner:
-    """Handles execution of benchmark operations."""
+class S3Backend:
+    """In-process S3 client used in place of ``aws s3`` command templates."""
     
     def __init__(self, config: BenchmarkConfig) -> None:
-        self.config = config
-        self.results: List[Dict] = []
+        # Parse templates once; anything that is not a plain `aws s3 cp/rm`
+        # keeps going through the shell
+        self.targets: Dict[str, Tuple[str, str, str]] = {}
+        for operation, template in (('put', config.put_cmd),
+                                    ('get', config.get_cmd),
+                                    ('delete', config.del_cmd)):
+            target = self.parse_template(operation, template) if template else None
+            if target:
+                self.targets[operation] = target
+        
+        self.client: Optional[Any] = None
+        if self.targets:
+            if not HAS_BOTO3:
+                raise RuntimeError("--use-sdk requires boto3 (pip install 'z-bench[s3]')")
+            
+            # Single session and client so connections are reused across operations
+            self.session = boto3.session.Session()
+            self.client = self.session.client(
+                's3', config=BotoConfig(max_pool_connections=64, tcp_keepalive=True)
+            )
+    
+    @staticmethod
+    def parse_template(operation: str, template: str) -> Optional[Tuple[str, str, str]]:
+        """Extract (bucket, key template, local destination) from an aws s3 template."""
+        try:
+            argv = shlex.split(template)
+        except ValueError:
+            return None
+        
+        # Extra CLI options (--endpoint-url, --quiet, ...) are left to the shell path
+        if argv[:2] != ['aws', 's3'] or any(arg.startswith('-') for arg in argv[2:]):
+            return None
+        args = argv[2:]
+        
+        dest = ''
+        if operation == 'put' and len(args) == 3 and args[0] == 'cp' and args[1] == '{file}':
+            uri = args[2]
+        elif operation == 'get' and len(args) == 3 and args[0] == 'cp' and not args[2].startswith('s3://'):
+            uri, dest = args[1], args[2]
+        elif operation == 'delete' and len(args) == 2 and args[0] == 'rm':
+            uri = args[1]
+        else:
+            return None
+        
+        if not uri.startswith('s3://'):
+            return None
+        bucket, _, key = uri[len('s3://'):].partition('/')
+        if not bucket:
+            return None
+        
+        return bucket, key, dest
+    
+    def execute(self, operation: str, filepath: str, filename: str) -> Tuple[bool, str, int, int]:
+        """Execute a single operation through the S3 client and measure timing."""
+        bucket, key, dest = self.targets[operation]
+        client = self.client
+        if client is None:
+            raise RuntimeError(f"No S3 client configured for {operation} operation")
+        
+        # Same key resolution as `aws s3 cp`: a trailing slash means "prefix"
+        key = key.replace('{filename}', filename)
+        if not key or key.endswith('/'):
+            key += filename
+        
+        if operation == 'get':
+            dest = dest.replace('{file}', filepath).replace('{filename}', filename)
+            if dest.endswith(('/', os.sep)) or os.path.isdir(dest):
+                dest = os.path.join(dest, filename)
+            os.makedirs(os.path.dirname(dest) or '.', exist_ok=True)
+        
+        start_time = time.perf_counter_ns()
+        
+        try:
+            if operation == 'put':
+                client.upload_file(filepath, bucket, key)
+            elif operation == 'get':
+                client.download_file(bucket, key, dest)
+            else:
+                client.delete_object(Bucket=bucket, Key=key)
+            end_time = time.perf_counter_ns()
+            return True, "", start_time, end_time
+        except (Boto3Error, BotoCoreError, ClientError, OSError) as e:
+            end_time = time.perf_counter_ns()
+            return False, str(e), start_time, end_time
+    
+    def close(self) -> None:
+        """Release the client's pooled connections."""
+        if self.client is not None:
+            self.client.close()
+
+
+class S5cmdBackend:
+    """Persistent ``s5cmd run`` processes fed one command per operation."""
+    
+    # Commands that print exactly one line per operation, and the command flags
+    # that can make them print nothing (the result line would never arrive)
+    COMMANDS = frozenset({'cp', 'mv', 'rm'})
+    SILENT_FLAGS = frozenset({'-n', '--no-clobber', '-s', '--if-source-newer',
+                              '-u', '--if-size-differ', '--show-progress'})
+    
+    # Seconds to wait for a command's result line before giving up on the process
+    TIMEOUT = 600.0
     
-    def run_warmup(self, operation: str, files: List[Path]) -> None:
-        """Run warm-up operations before measured benchmark."""
-        if self.config.warmup <= 0:
+    def __init__(self, run_argv: List[str], command: List[str]) -> None:
+        self.run_argv = run_argv
+        self.command = command
+        self._builders = [compile_template(arg) for arg in command]
+        
+        # Each process has at most one command in flight, so its next output
+        # line is that command's result; idle processes are handed between threads
+        self._idle: 'queue.SimpleQueue[subprocess.Popen[bytes]]' = queue.SimpleQueue()
+        self._procs: List['subprocess.Popen[bytes]'] = []
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def from_template(cls, template: str) -> Optional['S5cmdBackend']:
+        """Build a backend for an ``s5cmd`` template, or None if it needs the shell."""
+        # Placeholders are the only braces the template may contain
+        if SHELL_METACHARS.search(PLACEHOLDER.sub('', template)):
+            return None
+        
+        argv = template.split()
+        if not argv or os.path.basename(argv[0]) != 's5cmd':
+            return None
+        
+        # Global flags stay on the `s5cmd run` process; the rest is sent per operation.
+        # Output format flags are excluded since every command must print one plain line.
+        for i, arg in enumerate(argv[1:], 1):
+            if arg.startswith(('--log', '--json')):
+                return None
+            if arg in cls.COMMANDS:
+                if any(flag.split('=')[0] in cls.SILENT_FLAGS for flag in argv[i + 1:]):
+                    return None
+                return cls(argv[:i] + ['run'], argv[i:])
+        
+        return None
+    
+    def execute(self, operation: str, filepath: str, filename: str) -> Tuple[bool, str, int, int]:
+        """Send a single command to an s5cmd process and measure timing."""
+        line = ' '.join(shlex.quote(build(filepath, filename)) for build in self._builders) + '\n'
+        
+        try:
+            proc = self._acquire()
+        except OSError as e:
+            now = time.perf_counter_ns()
+            return False, str(e), now, now
+        
+        start_time = time.perf_counter_ns()
+        
+        try:
+            if proc.stdin is None or proc.stdout is None:
+                raise OSError("s5cmd pipes are not open")
+            proc.stdin.write(line.encode(errors='surrogateescape'))
+            output = self._readline(proc.stdout.fileno())
+        except (OSError, ValueError) as e:
+            # The process's output can no longer be matched to commands; retire it
+            end_time = time.perf_counter_ns()
+            proc.kill()
+            return False, str(e), start_time, end_time
+        
+        end_time = time.perf_counter_ns()
+        
+        if output is None:
+            # Process died; do not hand it out again
+            return False, f"s5cmd exited with code {proc.wait()}", start_time, end_time
+        
+        self._idle.put(proc)
+        
+        if output.startswith('ERROR'):
+            return False, output.strip(), start_time, end_time
+        return True, "", start_time, end_time
+    
+    def close(self) -> None:
+        """Terminate all s5cmd processes."""
+        with self._lock:
+            procs, self._procs = self._procs, []
+            self._idle = queue.SimpleQueue()
+        
+        for proc in procs:
+            if proc.stdin:
+                proc.stdin.close()
+            try:
+                proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
+    
+    def _acquire(self) -> 'subprocess.Popen[bytes]':
+        """Get an idle s5cmd process, starting a new one if none is free."""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        
+        # Unbuffered so reads can be bounded by select() on the raw pipe
+        proc = subprocess.Popen(
+            self.run_argv, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT, bufsize=0
+        )
+        with self._lock:
+            self._procs.append(proc)
+        return proc
+    
+    def _readline(self, fd: int) -> Optional[str]:
+        """Read one output line from an s5cmd process, or None if it exited."""
+        deadline = time.monotonic() + self.TIMEOUT
+        chunks: List[bytes] = []
+        
+        with selectors.DefaultSelector() as selector:
+            selector.register(fd, selectors.EVENT_READ)
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not selector.select(remaining):
+                    raise OSError(f"s5cmd gave no result within {self.TIMEOUT:g}s")
+                
+                chunk = os.read(fd, 65536)
+                if not chunk:
+                    return None
+                chunks.append(chunk)
+                if b'\n' in chunk:
+                    return b''.join(chunks).split(b'\n', 1)[0].decode(errors='replace')
+
+
+class LocalCopyBackend:
+    """In-process ``cp``/``rm`` for benchmarks against local or mounted filesystems."""
+    
+    def __init__(self, argv: List[str]) -> None:
+        self.argv = argv
+        # Like the real command, `rm -f` treats a missing file as success
+        self.force = argv[:2] == ['rm', '-f']
+        self._builders = [compile_template(arg) for arg in argv[2 if self.force else 1:]]
+    
+    @classmethod
+    def from_template(cls, template: str) -> Optional['LocalCopyBackend']:
+        """Build a backend for a plain ``cp SRC DST`` or ``rm [-f] PATH`` template."""
+        if SHELL_METACHARS.search(PLACEHOLDER.sub('', template)):
+            return None
+        
+        argv = template.split()
+        if len(argv) == 3 and argv[0] == 'cp':
+            return cls(argv)
+        if argv[:2] == ['rm', '-f'] and len(argv) == 3:
+            return cls(argv)
+        if len(argv) == 2 and argv[0] == 'rm':
+            return cls(argv)
+        return None
+    
+    def execute(self, operation: str, filepath: str, filename: str) -> Tuple[bool, str, int, int]:
+        """Copy or remove a single file in-process and measure timing."""
+        args = [build(filepath, filename) for build in self._builders]
+        
+        if self.argv[0] == 'cp':
+            src, dst = args
+            if dst.endswith(('/', os.sep)) or os.path.isdir(dst):
+                dst = os.path.join(dst, os.path.basename(src))
+        
+        start_time = time.perf_counter_ns()
+        
+        try:
+            if self.argv[0] == 'cp':
+                self._copy(src, dst)
+            else:
+                try:
+                    os.remove(args[0])
+                except FileNotFoundError:
+                    if not self.force:
+                        raise
+            end_time = time.perf_counter_ns()
+            return True, "", start_time, end_time
+        except OSError as e:
+            end_time = time.perf_counter_ns()
+            return False, str(e), start_time, end_time
+    
+    def close(self) -> None:
+        """Nothing to release; present for interface parity with other backends."""
+    
+    @staticmethod
+    def _copy(src: str, dst: str) -> None:
+        """Copy file contents inside the kernel where supported."""
+        if not hasattr(os, 'copy_file_range'):
+            shutil.copyfile(src, dst)
             return
+        
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            infd, outfd = fsrc.fileno(), fdst.fileno()
+            remaining = os.fstat(infd).st_size
             
-        cmd_template = self._get_command_template(operation)
-        if not cmd_template:
-            raise ValueError(f"No command template provided for {operation} operation")
+            while remaining > 0:
+                try:
+                    copied = os.copy_file_range(infd, outfd, remaining)
+                except OSError as e:
+                    # Cross-device or unsupported on this kernel/filesystem
+                    if e.errno in (errno.EXDEV, errno.ENOSYS, errno.EOPNOTSUPP, errno.EINVAL):
+                        fsrc.seek(0)
+                        fdst.seek(0)
+                        fdst.truncate()
+                        shutil.copyfileobj(fsrc, fdst)
+                        return
+                    raise
+                if copied == 0:
+                    break
+                remaining -= copied
+
+
+class BenchmarkRunner:
+    """Handles execution of benchmark operations."""
+    
+    def __init__(self, config: BenchmarkConfig, writer: Optional['OutputWriter'] = None) -> None:
+        self.config = config
+        self.writer = writer
         
-        warmup_files = files[:self.config.warmup]
-        print(f"Running {len(warmup_files)} warmup operations...")
+        # Results stream straight to the writer; they are only kept in memory
+        # when there is no writer to hand them to
+        self.results: Deque[Result] = deque(maxlen=0 if writer else None)
         
-        for i, filepath in enumerate(warmup_files, 1):
-            print(f"\rWarmup {i}/{len(warmup_files)}: {filepath.name}", end="", flush=True)
+        # Failed operations across all phases, for the process exit status
+        self.failures = 0
+        
+        # Operations whose templates can run without spawning a process per file
+        self.backends: Dict[str, Union[S3Backend, S5cmdBackend, LocalCopyBackend]] = {}
+        if config.use_sdk:
+            s3_backend = S3Backend(config)
+            for operation in s3_backend.targets:
+                self.backends[operation] = s3_backend
+        
+        for operation in ('put', 'get', 'delete'):
+            template = self._get_command_template(operation)
+            if not template or operation in self.backends:
+                continue
             
-            cmd = cmd_template.replace('{file}', str(filepath))
-            cmd = cmd.replace('{filename}', filepath.name)
-            success, error, latency_ns = self.execute_command(cmd, filepath.name)
+            # Both paths only emulate the spawned command, so they are opt-in
+            if config.io_backend != 'native':
+                continue
+            backend: Optional[Union[S5cmdBackend, LocalCopyBackend]]
+            backend = S5cmdBackend.from_template(template)
+            if backend is None:
+                backend = LocalCopyBackend.from_template(template)
+            if backend is not None:
+                self.backends[operation] = backend
+        
+        # Commands are built from templates compiled once per operation. Templates
+        # without shell syntax are also split into argv so they can be spawned
+        # directly (posix_spawn, no intermediate /bin/sh)
+        self._builders: Dict[str, Callable[[str, str], str]] = {}
+        self._argv_builders: Dict[str, List[Callable[[str, str], str]]] = {}
+        self._executables: Dict[str, str] = {}
+        for operation in ('put', 'get', 'delete'):
+            template = self._get_command_template(operation)
+            if not template:
+                continue
             
-            result = {
-                'timestamp_ns': time.perf_counter_ns(),
-                'operation': operation.upper(),
-                'filename': filepath.name,
-                'size_bytes': filepath.stat().st_size,
-                'latency_ns': latency_ns,
-                'status': 'success' if success else 'fail',
-                'error': error,
-                'warmup': True
-            }
+            self._builders[operation] = compile_template(template)
             
-            self.log_result(result)
-        
-        print()  # New line after progress
+            argv = template.split()
+            if argv and not SHELL_METACHARS.search(PLACEHOLDER.sub('', template)):
+                # posix_spawn is only used for an executable given by path
+                executable = shutil.which(argv[0])
+                if executable:
+                    self._executables[operation] = executable
+                    self._argv_builders[operation] = [compile_template(arg) for arg in argv]
     
-    def run_operation(self, operation: str, files: List[Path], is_warmup: bool = False) -> None:
-        """Run benchmark operations and collect timing data."""
+    def run_operation(self, operation: str, files: List[FileEntry], warmup_n: int = 0) -> None:
+        """Run benchmark operations and collect timing data.
+        
+        Each file is operated on once. The first ``warmup_n`` run one at a time
+        and are flagged as warmup; the rest run concurrently.
+        """
         cmd_template = self._get_command_template(operation)
         if not cmd_template:
             raise ValueError(f"No command template provided for {operation} operation")
         
-        print(f"Running {operation.upper()} benchmark on {len(files)} files...")
+        operation_name = OPERATION_NAMES[operation]
+        concurrency = max(1, self.config.concurrency)
+        warmup_n = max(0, warmup_n)
+        if warmup_n >= len(files) > 0:
+            # Keep at least one measured operation, or the phase would record nothing
+            print(f"Warning: --warmup {warmup_n} covers all {len(files)} files; "
+                  f"using {len(files) - 1} warmup operations", file=sys.stderr)
+            warmup_n = len(files) - 1
+        measured = len(files) - warmup_n
+        print(f"Running {operation_name} benchmark on {len(files)} files "
+              f"({warmup_n} warmup, concurrency: {concurrency})...")
         
-        for i, filepath in enumerate(files, 1):
-            # Simple progress indicator
-            percent = (i * 100) // len(files)
-            bar_length = 30
-            filled_length = (percent * bar_length) // 100
-            bar = '█' * filled_length + '░' * (bar_length - filled_length)
-            
-            print(f"\r[{bar}] {percent:3d}% ({i}/{len(files)}) {filepath.name}", end="", flush=True)
-            
-            cmd = cmd_template.replace('{file}', str(filepath))
-            cmd = cmd.replace('{filename}', filepath.name)
-            success, error, latency_ns = self.execute_command(cmd, filepath.name)
-            
-            result = {
-                'timestamp_ns': time.perf_counter_ns(),
-                'operation': operation.upper(),
-                'filename': filepath.name,
-                'size_bytes': filepath.stat().st_size,
-                'latency_ns': latency_ns,
-                'status': 'success' if success else 'fail',
-                'error': error,
-                'warmup': is_warmup
-            }
-            
-            self.log_result(result)
+        failures: List[str] = []
+        
+        # Warmup runs inline before anything is queued; everything after it is
+        # submitted up front so the pool always has work queued.
+        # submit_ns/complete_ns allow reconstructing queue depth afterwards
+        executor = ThreadPoolExecutor(max_workers=concurrency)
+        futures: Dict[Future, Tuple[FileEntry, int]] = {}
+        try:
+            for idx, entry in enumerate(files):
+                path, name, size = entry
+                
+                if idx >= warmup_n:
+                    submit_ns = time.perf_counter_ns()
+                    future = executor.submit(self.execute_command, operation, path, name)
+                    futures[future] = (entry, submit_ns)
+                    continue
+                
+                print(f"\rWarmup {idx + 1}/{warmup_n}: {name}", end="", flush=True)
+                
+                # Queueing and collection coincide with the command itself here
+                success, error, start_ns, end_ns = self.execute_command(operation, path, name)
+                self.log_result(Result(
+                    start_ns, operation_name, name, size, end_ns - start_ns,
+                    STATUS_SUCCESS if success else STATUS_FAIL, error, True, start_ns, end_ns
+                ))
+                
+                if not success:
+                    self._record_failure(error, failures)
+                if idx + 1 == warmup_n:
+                    print()  # New line after warmup progress
             
-            if not success:
-                print()  # New line before error
-                raise RuntimeError(f"Command failed: {error}")
+            # Results are built and logged here only, keeping self.results single-threaded.
+            # Logged futures are dropped so an abort can tell which are still unlogged
+            for i, future in enumerate(as_completed(futures), 1):
+                (_, name, _), _ = futures[future]
+                
+                # Simple progress indicator
+                percent = (i * 100) // measured
+                bar_length = 30
+                filled_length = (percent * bar_length) // 100
+                bar = '█' * filled_length + '░' * (bar_length - filled_length)
+                
+                print(f"\r[{bar}] {percent:3d}% ({i}/{measured}) {name}", end="", flush=True)
+                
+                success, error = self._log_future(operation_name, future, futures.pop(future))
+                if not success:
+                    self._record_failure(error, failures, futures)
+        except BaseException:
+            # Interrupted or aborted: drop queued operations instead of running them
+            # all on the way out, and keep the results that already came back
+            executor.shutdown(wait=False, cancel_futures=True)
+            for future, item in futures.items():
+                if future.done() and not future.cancelled() and future.exception() is None:
+                    self._log_future(operation_name, future, item)
+            raise
         
-        print()  # New line after progress
+        executor.shutdown()
+        
+        if measured:
+            print()  # New line after progress
+        
+        if failures:
+            print(f"Warning: {len(failures)}/{len(files)} {operation_name} operations failed "
+                  f"(first error: {failures[0]})", file=sys.stderr)
     
-    def execute_command(self, cmd: str, filename: str) -> Tuple[bool, str, int]:
+    def execute_command(self, operation: str, path: str, filename: str) -> Tuple[bool, str, int, int]:
         """Execute a single command and measure timing."""
+        backend = self.backends.get(operation)
+        if backend is not None:
+            return backend.execute(operation, path, filename)
+        
+        argv_builders = self._argv_builders.get(operation)
+        if argv_builders is not None:
+            cmd: Union[str, List[str]] = [build(path, filename) for build in argv_builders]
+        else:
+            cmd = self._builders[operation](path, filename)
+        
         start_time = time.perf_counter_ns()
         
         try:
-            result = subprocess.run(
-                cmd, shell=True, capture_output=True, text=True, check=True
+            # stdout is never used; close_fds=False keeps CPython on its posix_spawn path
+            # (descriptors are non-inheritable by default, so nothing leaks into children)
+            subprocess.run(
+                cmd, shell=argv_builders is None, executable=self._executables.get(operation),
+                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True,
+                close_fds=False
             )
             end_time = time.perf_counter_ns()
-            return True, "", end_time - start_time
+            return True, "", start_time, end_time
         except subprocess.CalledProcessError as e:
             end_time = time.perf_counter_ns()
             error_msg = e.stderr.strip() if e.stderr else str(e)
-            return False, error_msg, end_time - start_time
+            return False, error_msg, start_time, end_time
+        except OSError as e:
+            end_time = time.perf_counter_ns()
+            return False, str(e), start_time, end_time
+    
+    def _log_future(self, operation_name: str, future: Future,
+                    item: Tuple[FileEntry, int]) -> Tuple[bool, str]:
+        """Log the result of a completed measured operation."""
+        success, error, start_ns, end_ns = future.result()
+        complete_ns = time.perf_counter_ns()
+        (_, name, size), submit_ns = item
+        
+        self.log_result(Result(
+            start_ns, operation_name, name, size, end_ns - start_ns,
+            STATUS_SUCCESS if success else STATUS_FAIL, error, False,
+            submit_ns, complete_ns
+        ))
+        return success, error
+    
+    def _record_failure(self, error: str, failures: List[str],
+                        pending: Optional[Dict[Future, Tuple[FileEntry, int]]] = None) -> None:
+        """Collect a failed operation's error, or abort the phase under --fail-fast."""
+        if self.config.fail_fast:
+            for future in pending or ():
+                future.cancel()
+            print()  # New line before error
+            raise RuntimeError(f"Command failed: {error}")
+        failures.append(error)
+        self.failures += 1
     
-    def log_result(self, result: Dict) -> None:
+    def log_result(self, result: Result) -> None:
         """Log a single benchmark result."""
+        if self.writer:
+            self.writer.write_result(result)
         self.results.append(result)
     
+    def close(self) -> None:
+        """Release resources held by backends."""
+        for backend in set(self.backends.values()):
+            backend.close()
+    
     def _get_command_template(self, operation: str) -> Optional[str]:
         """Get command template for operation."""
         if operation == 'put':
@@ -242,9 +999,21 @@ class OutputWriter:
     def __init__(self, output_path: Path, no_log: bool = False) -> None:
         self.output_path = output_path
         self.no_log = no_log
-        self.buffer: List[Dict] = []
+        self.buffer: List[Result] = []
+        self.is_csv = output_path.suffix.lower() == '.csv'
+        self.is_parquet = output_path.suffix.lower() == '.parquet'
+        
+        if self.is_parquet and not HAS_PYARROW and not no_log:
+            raise RuntimeError("Parquet output requires pyarrow (pip install 'z-bench[parquet]')")
+        
+        # Columnar output is written in large batches rather than every 100 rows
+        self.batch_size = PARQUET_BATCH_ROWS if self.is_parquet else 100
+        
+        # Opened on first flush so modes that never log don't create the file
+        self._fh: Optional[IO[bytes]] = None
+        self._parquet: Optional[Any] = None
     
-    def write_result(self, result: Dict) -> None:
+    def write_result(self, result: Result) -> None:
         """Write a single result to output."""
         if self.no_log:
             return
@@ -252,44 +1021,126 @@ class OutputWriter:
         self.buffer.append(result)
         
         # Flush buffer when it gets large
-        if len(self.buffer) >= 100:
+        if len(self.buffer) >= self.batch_size:
             self.flush()
     
     def flush(self) -> None:
         """Flush buffered results to file."""
         if self.no_log or not self.buffer:
             return
+        
+        if self.is_parquet:
+            self._write_parquet()
+            self.buffer.clear()
+            return
+        
+        fh = self._fh if self._fh is not None else self._open()
             
-        if self.output_path.suffix.lower() == '.csv':
-            self._write_csv()
+        if self.is_csv:
+            self._write_csv(fh)
         else:
-            self._write_jsonl()
+            self._write_jsonl(fh)
         
         self.buffer.clear()
     
-    def _write_csv(self) -> None:
+    def close(self) -> None:
+        """Flush remaining results and close the output file."""
+        self.flush()
+        
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+        
+        # The footer is only written on close; without it the file is unreadable
+        if self._parquet is not None:
+            self._parquet.close()
+            self._parquet = None
+    
+    def _open(self) -> IO[bytes]:
+        """Open the output file once and write the CSV header if it is new."""
+        fh = self._fh = open(self.output_path, 'a+b', buffering=1 << 16)
+        
+        if self.is_csv:
+            if fh.tell() == 0:
+                fh.write(CSV_HEADER.encode())
+            else:
+                self._check_header(fh)
+        return fh
+    
+    def _check_header(self, fh: IO[bytes]) -> None:
+        """Refuse to append rows under a different CSV header."""
+        fh.seek(0)
+        header = fh.readline().decode(errors='replace').rstrip()
+        fh.seek(0, os.SEEK_END)
+        
+        # Appending rows under a different header would misalign every column
+        if header != CSV_HEADER.rstrip():
+            fh.close()
+            self._fh = None
+            raise RuntimeError(f"Cannot append to {self.output_path}: existing header "
+                               f"'{header}' does not match '{CSV_HEADER.rstrip()}'")
+    
+    def _write_csv(self, fh: IO[bytes]) -> None:
         """Write results to CSV file."""
-        file_exists = self.output_path.exists()
+        rows = []
+        for result in self.buffer:
+            # Only free-form text fields can need quoting
+            if CSV_SPECIAL.search(result.error) or CSV_SPECIAL.search(result.filename):
+                result = result._replace(error=self._csv_quote(result.error),
+                                         filename=self._csv_quote(result.filename))
+            rows.append(CSV_ROW.format(*result))
         
-        with open(self.output_path, 'a', newline='') as f:
-            if not self.buffer:
-                return
-                
-            fieldnames = ['timestamp_ns', 'operation', 'filename', 'size_bytes', 
-                         'latency_ns', 'status', 'error', 'warmup']
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            
-            if not file_exists:
-                writer.writeheader()
-            
-            writer.writerows(self.buffer)
+        fh.write(''.join(rows).encode())
     
-    def _write_jsonl(self) -> None:
+    def _write_jsonl(self, fh: IO[bytes]) -> None:
         """Write results to JSON Lines file."""
-        with open(self.output_path, 'a') as f:
-            for result in self.buffer:
-                json.dump(result, f)
-                f.write('\n')
+        if HAS_ORJSON:
+            fh.write(b''.join(orjson.dumps(result._asdict()) + b'\n' for result in self.buffer))
+        else:
+            fh.write(''.join(json.dumps(result._asdict(), separators=(',', ':'),
+                                        ensure_ascii=False) + '\n'
+                             for result in self.buffer).encode())
+    
+    def _write_parquet(self) -> None:
+        """Write buffered results to the Parquet file as one record batch."""
+        schema = self._parquet_schema()
+        if self._parquet is None:
+            self._parquet = pq.ParquetWriter(self.output_path, schema, compression='zstd',
+                                             use_dictionary=['operation', 'status'])
+        
+        # Transpose rows into one array per column
+        arrays = []
+        for column, field in zip(zip(*self.buffer), schema):
+            if pa.types.is_dictionary(field.type):
+                arrays.append(pa.array(column, type=pa.string()).dictionary_encode())
+            else:
+                arrays.append(pa.array(column, type=field.type))
+        
+        self._parquet.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+    
+    @staticmethod
+    def _parquet_schema() -> Any:
+        """Return the Arrow schema for Parquet output, in FIELDS order."""
+        labels = pa.dictionary(pa.int32(), pa.string())
+        return pa.schema([
+            ('timestamp_ns', pa.int64()),
+            ('operation', labels),
+            ('filename', pa.string()),
+            ('size_bytes', pa.int64()),
+            ('latency_ns', pa.int64()),
+            ('status', labels),
+            ('error', pa.string()),
+            ('warmup', pa.bool_()),
+            ('submit_ns', pa.int64()),
+            ('complete_ns', pa.int64()),
+        ])
+    
+    @staticmethod
+    def _csv_quote(value: str) -> str:
+        """Quote a CSV field that contains a delimiter, quote or line break."""
+        if CSV_SPECIAL.search(value):
+            return '"' + value.replace('"', '""') + '"'
+        return value
 
 
 class ZBenchmarker:
@@ -298,11 +1149,12 @@ class ZBenchmarker:
     def __init__(self, config: BenchmarkConfig) -> None:
         self.config = config
         self.file_generator = FileGenerator(config)
-        self.benchmark_runner = BenchmarkRunner(config)
         self.output_writer: Optional[OutputWriter] = None
         
         if config.out_file:
             self.output_writer = OutputWriter(config.out_file, config.no_log)
+        
+        self.benchmark_runner = BenchmarkRunner(config, self.output_writer)
     
     def run_generate(self) -> List[Path]:
         """Run file generation mode."""
@@ -314,24 +1166,17 @@ class ZBenchmarker:
             raise ValueError("Input directory does not exist")
         
         # Get list of files to benchmark
-        files = list(self.config.input_dir.glob('*.bin'))
+        files = self._discover_files(self.config.input_dir)
         if not files:
             raise ValueError("No .bin files found in input directory")
         
-        files.sort()  # Ensure consistent order
-        
         print(f"Running {operation} benchmark on {len(files)} files...")
         
-        # Run warmup phase
-        self.benchmark_runner.run_warmup(operation, files)
+        # Warmup and measured operations run in a single pass over the files
+        self.benchmark_runner.run_operation(operation, files, warmup_n=self.config.warmup)
         
-        # Run main benchmark
-        self.benchmark_runner.run_operation(operation, files)
-        
-        # Write results
+        # Results were streamed during the run; push out the tail
         if self.output_writer:
-            for result in self.benchmark_runner.results:
-                self.output_writer.write_result(result)
             self.output_writer.flush()
         
         print(f"Completed {operation} benchmark")
@@ -343,32 +1188,35 @@ class ZBenchmarker:
         # Determine which files to use
         if self.config.input_dir and self.config.input_dir.exists():
             # Use existing files
-            files = list(self.config.input_dir.glob('*.bin'))
+            files = self._discover_files(self.config.input_dir)
             if not files:
                 raise ValueError(f"No .bin files found in {self.config.input_dir}")
-            files.sort()
             print(f"Using {len(files)} existing files from {self.config.input_dir}")
         else:
             # Generate new files
             if not self.config.output_dir or not self.config.file_size or not self.config.total_size:
                 raise ValueError("Must provide --output-dir, --file-size, and --total-size for file generation, or --input-dir for existing files")
             
+            files = []
             if self.config.reuse_files and self.config.output_dir.exists():
-                existing_files = list(self.config.output_dir.glob('*.bin'))
-                if existing_files:
-                    files = sorted(existing_files)
+                files = self._discover_files(self.config.output_dir)
+                if files:
                     print(f"Reusing {len(files)} existing files from {self.config.output_dir}")
-                else:
-                    files = self.file_generator.generate_files()
-            else:
-                files = self.file_generator.generate_files()
+            
+            if not files:
+                # Every generated file has the requested size, so nothing needs a stat()
+                generated = self.file_generator.generate_files()
+                size = self.config.file_size_bytes
+                if size is None:
+                    raise ValueError("File size was not resolved during generation")
+                files = [(str(path), path.name, size) for path in generated]
         
         # TODO: Implement full benchmark sequence
-        # 1. PUT warm-up and benchmark
+        # 1. PUT benchmark (first --warmup files flagged as warmup)
         # 2. Wait
-        # 3. GET warm-up and benchmark  
+        # 3. GET benchmark
         # 4. Wait
-        # 5. DELETE warm-up and benchmark
+        # 5. DELETE benchmark
         
         # Validate that all required commands are provided
         if not all([self.config.put_cmd, self.config.get_cmd, self.config.del_cmd]):
@@ -376,8 +1224,7 @@ class ZBenchmarker:
         
         # Run PUT benchmark
         print("\n=== PUT Phase ===")
-        self.benchmark_runner.run_warmup('put', files)
-        self.benchmark_runner.run_operation('put', files)
+        self.benchmark_runner.run_operation('put', files, warmup_n=self.config.warmup)
         
         # Wait between phases
         if self.config.wait > 0:
@@ -386,8 +1233,7 @@ class ZBenchmarker:
         
         # Run GET benchmark
         print("\n=== GET Phase ===")
-        self.benchmark_runner.run_warmup('get', files)
-        self.benchmark_runner.run_operation('get', files)
+        self.benchmark_runner.run_operation('get', files, warmup_n=self.config.warmup)
         
         # Wait between phases
         if self.config.wait > 0:
@@ -396,17 +1242,29 @@ class ZBenchmarker:
         
         # Run DELETE benchmark
         print("\n=== DELETE Phase ===")
-        self.benchmark_runner.run_warmup('delete', files)
-        self.benchmark_runner.run_operation('delete', files)
+        self.benchmark_runner.run_operation('delete', files, warmup_n=self.config.warmup)
         
-        # Write all results
+        # Results were streamed during the run; push out the tail
         if self.output_writer:
-            for result in self.benchmark_runner.results:
-                self.output_writer.write_result(result)
             self.output_writer.flush()
         
         print(f"\nCompleted full benchmark cycle with {len(files)} files")
     
+    @staticmethod
+    def _discover_files(directory: Path) -> List[FileEntry]:
+        """List .bin files in a directory in name order, sizing each exactly once."""
+        with os.scandir(directory) as it:
+            entries = [(entry.path, entry.name, entry.stat().st_size) for entry in it
+                       if entry.name.endswith('.bin')]
+        entries.sort(key=lambda entry: entry[1])
+        return entries
+    
+    def close(self) -> None:
+        """Release backend processes and connections and close the output file."""
+        self.benchmark_runner.close()
+        if self.output_writer:
+            self.output_writer.close()
+    
     def validate_commands(self) -> None:
         """Validate that required commands are provided for --ALL mode."""
         # TODO: Implement command validation
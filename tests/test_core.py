@@ -0,0 +1,522 @@
+"""Tests for file generation, benchmark execution, output serialization and command template parsing."""
+
+import csv
+import io
+import json
+import os
+import signal
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Iterator, List, Tuple
+
+import pytest
+
+from z_bench import cli, core
+from z_bench.core import (
+    FIELDS,
+    BenchmarkConfig,
+    BenchmarkRunner,
+    FileEntry,
+    FileGenerator,
+    LocalCopyBackend,
+    OutputWriter,
+    Result,
+    S3Backend,
+    S5cmdBackend,
+    ZBenchmarker,
+    compile_template,
+)
+
+
+def test_generate_files(tmp_path: Path) -> None:
+    config = BenchmarkConfig()
+    config.output_dir = tmp_path / 'gen'
+    config.file_size = '1000'
+    config.total_size = '5KB'
+    files = FileGenerator(config).generate_files()
+
+    assert [f.name for f in files] == [f'file_{i:04d}.bin' for i in range(1, 6)]
+    assert all(f.stat().st_size == 1000 for f in files)
+
+
+@pytest.mark.parametrize('content_mode', ['shared', 'unique'])
+def test_generated_content_is_reproducible(tmp_path: Path, content_mode: str) -> None:
+    runs = []
+    for run in ('a', 'b'):
+        config = BenchmarkConfig()
+        config.output_dir = tmp_path / run
+        config.file_size = '64KB'
+        config.total_size = '256KB'
+        config.content_mode = content_mode
+        runs.append([path.read_bytes() for path in FileGenerator(config).generate_files()])
+
+    assert runs[0] == runs[1]
+    assert all(len(data) == 64 * 1024 for data in runs[0])
+    assert len(set(runs[0])) == (1 if content_mode == 'shared' else 4)
+
+
+def test_verify_rejects_short_files(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    config = BenchmarkConfig()
+    config.output_dir = tmp_path / 'gen'
+    config.file_size = '1KB'
+    config.total_size = '4KB'
+    config.verify = True
+    assert len(FileGenerator(config).generate_files()) == 4
+
+    # Every file comes out truncated
+    monkeypatch.setattr(core, '_send_template', lambda fd, size: os.ftruncate(fd, 1) is None)
+    with pytest.raises(RuntimeError, match='4 generated files have the wrong size'):
+        FileGenerator(config).generate_files()
+
+
+def test_shared_content_warns_about_repeated_blocks(tmp_path: Path,
+                                                    capsys: pytest.CaptureFixture[str]) -> None:
+    config = BenchmarkConfig()
+    config.output_dir = tmp_path / 'gen'
+    config.file_size = config.total_size = str(core.TEMPLATE_SIZE + 1)
+    data = FileGenerator(config).generate_files()[0].read_bytes()
+
+    assert data[core.TEMPLATE_SIZE:] == data[:1]
+    assert 'each repeats one 4MB block' in capsys.readouterr().err
+
+
+def make_runner(tmp_path: Path, put_cmd: str, count: int = 10,
+                **options: object) -> Tuple[BenchmarkRunner, List[FileEntry]]:
+    """Create a runner for put_cmd and count small input files."""
+    input_dir = tmp_path / 'in'
+    input_dir.mkdir(parents=True)
+    for i in range(count):
+        (input_dir / f'file_{i:04d}.bin').write_bytes(b'x' * 10)
+
+    config = BenchmarkConfig()
+    config.input_dir = input_dir
+    config.put_cmd = put_cmd
+    for name, value in options.items():
+        setattr(config, name, value)
+    return BenchmarkRunner(config), ZBenchmarker._discover_files(input_dir)
+
+
+def test_discover_files_matches_glob(tmp_path: Path) -> None:
+    for name in ['b.bin', 'a.bin', '.hidden.bin', 'notes.txt', 'c.bin.tmp']:
+        (tmp_path / name).write_bytes(b'')
+
+    names = [name for _, name, _ in ZBenchmarker._discover_files(tmp_path)]
+    assert names == sorted(p.name for p in tmp_path.glob('*.bin'))
+    assert '.hidden.bin' in names
+
+
+def test_discover_files_sizes_each_file(tmp_path: Path) -> None:
+    (tmp_path / 'a.bin').write_bytes(b'x' * 7)
+
+    assert ZBenchmarker._discover_files(tmp_path) == [(str(tmp_path / 'a.bin'), 'a.bin', 7)]
+
+
+def test_run_operation_logs_each_file_once(tmp_path: Path) -> None:
+    dst_dir = tmp_path / 'dst'
+    dst_dir.mkdir()
+    runner, files = make_runner(tmp_path, f'cp {{file}} {dst_dir}/', concurrency=4)
+    runner.run_operation('put', files)
+
+    assert sorted(r.filename for r in runner.results) == [name for _, name, _ in files]
+    assert all(r.status == 'success' for r in runner.results)
+    assert sorted(p.name for p in dst_dir.iterdir()) == [name for _, name, _ in files]
+    assert runner.failures == 0
+
+
+def test_warmup_is_first_files_of_single_pass(tmp_path: Path) -> None:
+    runner, files = make_runner(tmp_path, 'true', concurrency=4)
+    runner.run_operation('put', files, warmup_n=3)
+
+    names = [name for _, name, _ in files]
+    assert sorted(r.filename for r in runner.results) == names
+    assert [r.filename for r in runner.results if r.warmup] == names[:3]
+    assert [r.filename for r in list(runner.results)[:3]] == names[:3]
+
+
+def test_warmup_leaves_one_measured_operation(tmp_path: Path,
+                                              capsys: pytest.CaptureFixture[str]) -> None:
+    runner, files = make_runner(tmp_path, 'true', count=3)
+    runner.run_operation('put', files, warmup_n=5)
+
+    assert [r.warmup for r in runner.results] == [True, True, False]
+    assert 'using 2 warmup operations' in capsys.readouterr().err
+
+
+def test_result_timestamps_are_ordered(tmp_path: Path) -> None:
+    runner, files = make_runner(tmp_path, 'true')
+    runner.run_operation('put', files, warmup_n=2)
+
+    for r in runner.results:
+        assert r.submit_ns <= r.timestamp_ns
+        assert r.timestamp_ns + r.latency_ns <= r.complete_ns
+
+
+@pytest.mark.parametrize('template, spawned', [
+    ('cp {file} /tmp/dst/', True),
+    ('true', True),
+    ('cat {file} | tee /tmp/dst/{filename}', False),
+    ('cp {file} $HOME/dst/', False),
+    ('FOO=1 cp {file} /tmp/dst/', False),
+    ("cp '{file}' /tmp/dst/", False),
+    ('cp {file} /tmp/dst/ > /dev/null', False),
+    ('no-such-command-z-bench {file}', False),
+])
+def test_plain_templates_are_spawned_directly(tmp_path: Path, template: str, spawned: bool) -> None:
+    runner, _ = make_runner(tmp_path, template, count=0)
+
+    assert ('put' in runner._argv_builders) is spawned
+
+
+def test_spawned_command_keeps_path_with_spaces(tmp_path: Path) -> None:
+    dst_dir = tmp_path / 'dst'
+    dst_dir.mkdir()
+    runner, files = make_runner(tmp_path / 'with space', f'cp {{file}} {dst_dir}/', count=2)
+    runner.run_operation('put', files)
+
+    assert 'put' in runner._argv_builders
+    assert runner.failures == 0
+    assert sorted(p.name for p in dst_dir.iterdir()) == [name for _, name, _ in files]
+
+
+def test_results_stream_to_writer(tmp_path: Path) -> None:
+    runner, files = make_runner(tmp_path, 'true')
+    writer = OutputWriter(tmp_path / 'out.csv')
+    runner = BenchmarkRunner(runner.config, writer)
+    runner.run_operation('put', files)
+    writer.close()
+
+    assert not runner.results
+    assert len((tmp_path / 'out.csv').read_text().splitlines()) == len(files) + 1
+
+
+def test_run_operation_counts_failures(tmp_path: Path) -> None:
+    runner, files = make_runner(tmp_path, 'false', concurrency=4)
+    runner.run_operation('put', files)
+
+    assert len(runner.results) == len(files)
+    assert all(r.status == 'fail' for r in runner.results)
+    assert runner.failures == len(files)
+
+
+def test_fail_fast_leaves_queued_work_unrun(tmp_path: Path) -> None:
+    log = tmp_path / 'ran.log'
+    runner, files = make_runner(tmp_path, f'echo {{filename}} >> {log}; false',
+                                concurrency=1, fail_fast=True)
+
+    with pytest.raises(RuntimeError, match='Command failed'):
+        runner.run_operation('put', files)
+
+    # At most the next queued operation had started by the time the pool was stopped
+    time.sleep(0.2)
+    assert len(log.read_text().split()) <= 2
+    assert runner.results[0].status == 'fail'
+
+
+def test_interrupt_keeps_completed_results(tmp_path: Path) -> None:
+    runner, files = make_runner(tmp_path, 'sleep 0.2', concurrency=2)
+    timer = threading.Timer(0.5, signal.pthread_kill, (threading.get_ident(), signal.SIGINT))
+    timer.start()
+    start = time.monotonic()
+
+    with pytest.raises(KeyboardInterrupt):
+        runner.run_operation('put', files)
+
+    # Queued operations are cancelled rather than drained (10 files take 1s)
+    assert time.monotonic() - start < 0.9
+    names = [r.filename for r in runner.results]
+    assert 0 < len(names) < len(files)
+    assert len(set(names)) == len(names)
+
+
+def test_cli_exits_nonzero_on_failures(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    runner, _ = make_runner(tmp_path, 'false')
+    monkeypatch.setattr(sys, 'argv', [
+        'z-bench', 'benchmark', '--op', 'put', '--input-dir', str(runner.config.input_dir),
+        '--put-cmd', 'false', '--warmup', '0', '--out', str(tmp_path / 'out.csv'),
+    ])
+
+    with pytest.raises(SystemExit) as exc_info:
+        cli.main()
+    assert exc_info.value.code == 1
+
+
+# Free-form fields exercise every character that needs CSV quoting
+RESULTS = [
+    Result(1, 'PUT', 'file_0001.bin', 1024, 500, 'success', '', True, 1, 501),
+    Result(2, 'GET', 'a,b.bin', 1024, 600, 'fail', 'said "no"', False, 2, 602),
+    Result(3, 'DELETE', 'line\nbreak.bin', 0, 700, 'fail', 'err\r\nmore', False, 3, 703),
+    Result(4, 'PUT', 'é.bin', 1, 800, 'success', '', False, 4, 804),
+]
+
+
+def write_results(path: Path, results: list) -> bytes:
+    """Write results through OutputWriter and return the file contents."""
+    writer = OutputWriter(path)
+    for result in results:
+        writer.write_result(result)
+    writer.close()
+    return path.read_bytes()
+
+
+def test_csv_matches_csv_module(tmp_path: Path) -> None:
+    expected = io.StringIO(newline='')
+    dict_writer = csv.DictWriter(expected, fieldnames=FIELDS)
+    dict_writer.writeheader()
+    for result in RESULTS:
+        dict_writer.writerow(result._asdict())
+
+    assert write_results(tmp_path / 'out.csv', RESULTS) == expected.getvalue().encode()
+
+
+def test_csv_header_written_once_when_appending(tmp_path: Path) -> None:
+    path = tmp_path / 'out.csv'
+    write_results(path, RESULTS[:1])
+    lines = write_results(path, RESULTS[:1]).decode().split('\r\n')
+
+    assert lines[0] == ','.join(FIELDS)
+    assert len(lines) == 4  # Header, two rows, trailing empty string
+
+
+@pytest.mark.parametrize('has_orjson', [False, True])
+def test_jsonl_round_trips(tmp_path: Path, monkeypatch: pytest.MonkeyPatch,
+                           has_orjson: bool) -> None:
+    if has_orjson:
+        pytest.importorskip('orjson')
+    monkeypatch.setattr(core, 'HAS_ORJSON', has_orjson)
+
+    lines = write_results(tmp_path / 'out.jsonl', RESULTS).decode().splitlines()
+
+    assert [json.loads(line) for line in lines] == [r._asdict() for r in RESULTS]
+    assert '"é.bin"' in lines[3]
+
+
+def test_jsonl_fallback_matches_orjson(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    pytest.importorskip('orjson')
+    fast = write_results(tmp_path / 'fast.jsonl', RESULTS)
+    monkeypatch.setattr(core, 'HAS_ORJSON', False)
+
+    assert write_results(tmp_path / 'stdlib.jsonl', RESULTS) == fast
+
+
+def test_parquet_round_trips(tmp_path: Path) -> None:
+    pq = pytest.importorskip('pyarrow.parquet')
+    path = tmp_path / 'out.parquet'
+    write_results(path, RESULTS)
+
+    table = pq.read_table(path)
+    assert table.column_names == FIELDS
+    assert table.to_pylist() == [r._asdict() for r in RESULTS]
+
+
+def test_csv_append_rejects_other_header(tmp_path: Path) -> None:
+    path = tmp_path / 'out.csv'
+    path.write_text('timestamp_ns,operation,filename,size_bytes,latency_ns,status,error,warmup\r\n')
+    writer = OutputWriter(path)
+    writer.write_result(RESULTS[0])
+
+    with pytest.raises(RuntimeError, match='does not match'):
+        writer.flush()
+
+
+@pytest.mark.parametrize('template, expected', [
+    ('aws s3 rm s3://bucket/fixed', 'aws s3 rm s3://bucket/fixed'),
+    ('aws s3 cp {file} s3://bucket/', 'aws s3 cp /data/f.bin s3://bucket/'),
+    ('aws s3 rm s3://bucket/{filename}', 'aws s3 rm s3://bucket/f.bin'),
+    ('cp {file} /mnt/{filename}.copy', 'cp /data/f.bin /mnt/f.bin.copy'),
+    ('{filename}{file}{filename}', 'f.bin/data/f.binf.bin'),
+])
+def test_compile_template(template: str, expected: str) -> None:
+    assert compile_template(template)('/data/f.bin', 'f.bin') == expected
+
+
+def test_compile_template_does_not_resubstitute_values() -> None:
+    build = compile_template('{file} {filename}')
+
+    assert build('/data/{filename}', 'f.bin') == '/data/{filename} f.bin'
+
+
+@pytest.mark.parametrize('operation, template, expected', [
+    ('put', 'aws s3 cp {file} s3://bucket/', ('bucket', '', '')),
+    ('put', 'aws s3 cp {file} s3://bucket/prefix/{filename}', ('bucket', 'prefix/{filename}', '')),
+    ('get', 'aws s3 cp s3://bucket/{filename} ./downloads/', ('bucket', '{filename}', './downloads/')),
+    ('delete', 'aws s3 rm s3://bucket/{filename}', ('bucket', '{filename}', '')),
+])
+def test_s3_parse_template(operation: str, template: str, expected: tuple) -> None:
+    assert S3Backend.parse_template(operation, template) == expected
+
+
+@pytest.mark.parametrize('operation, template', [
+    ('put', 'aws s3 cp {file} s3://bucket/ --endpoint-url http://localhost:9000'),
+    ('put', 'aws s3 cp {file} ./local/'),
+    ('put', 'aws s3 sync {file} s3://bucket/'),
+    ('put', "aws s3 cp '{file} s3://bucket/"),
+    ('get', 'aws s3 cp s3://bucket/{filename} s3://other/'),
+    ('delete', 'aws s3 rm s3:///{filename}'),
+    ('delete', 'gsutil rm gs://bucket/{filename}'),
+])
+def test_s3_parse_template_rejects(operation: str, template: str) -> None:
+    assert S3Backend.parse_template(operation, template) is None
+
+
+@pytest.mark.parametrize('template, force', [
+    ('cp {file} /mnt/target/', False),
+    ('rm /mnt/target/{filename}', False),
+    ('rm -f /mnt/target/{filename}', True),
+])
+def test_local_copy_from_template(template: str, force: bool) -> None:
+    backend = LocalCopyBackend.from_template(template)
+
+    assert backend is not None
+    assert backend.argv == template.split()
+    assert backend.force is force
+
+
+@pytest.mark.parametrize('template', [
+    'cp -r {file} /mnt/target/',
+    'rm -rf /mnt/target/{filename}',
+    'cp {file} /mnt/target/ && sync',
+    'mv {file} /mnt/target/',
+])
+def test_local_copy_from_template_rejects(template: str) -> None:
+    assert LocalCopyBackend.from_template(template) is None
+
+
+def test_local_copy_executes_cp_and_rm(tmp_path: Path) -> None:
+    src = tmp_path / 'f.bin'
+    src.write_bytes(b'x' * 1000)
+    dst_dir = tmp_path / 'dst'
+    dst_dir.mkdir()
+
+    cp = LocalCopyBackend.from_template(f'cp {{file}} {dst_dir}/')
+    rm = LocalCopyBackend.from_template(f'rm {dst_dir}/{{filename}}')
+    rm_force = LocalCopyBackend.from_template(f'rm -f {dst_dir}/{{filename}}')
+    assert cp is not None and rm is not None and rm_force is not None
+
+    assert cp.execute('put', str(src), 'f.bin')[0]
+    assert (dst_dir / 'f.bin').read_bytes() == src.read_bytes()
+    assert rm.execute('delete', str(src), 'f.bin')[0]
+    assert not (dst_dir / 'f.bin').exists()
+
+    # A missing file fails plain rm but not rm -f, as with the real command
+    assert not rm.execute('delete', str(src), 'f.bin')[0]
+    assert rm_force.execute('delete', str(src), 'f.bin')[0]
+
+
+@pytest.mark.parametrize('size, expected', [
+    ('100', 100),
+    ('5B', 5),
+    ('10MB', 10 * 1024**2),
+    (' 1.5 gb ', 3 * 1024**3 // 2),
+    ('1e3KB', 1000 * 1024),
+    ('2TB', 2 * 1024**4),
+])
+def test_parse_size(size: str, expected: int) -> None:
+    assert BenchmarkConfig.parse_size(size) == expected
+
+
+@pytest.mark.parametrize('size', ['1.5', '10M', 'MB', 'abc', '1.2.3MB', 'infGB', ''])
+def test_parse_size_rejects(size: str) -> None:
+    with pytest.raises(ValueError, match='Invalid size format'):
+        BenchmarkConfig.parse_size(size)
+
+
+def test_file_generator_parse_size_delegates_to_config() -> None:
+    assert FileGenerator(BenchmarkConfig()).parse_size('4KB') == 4096
+
+
+@pytest.mark.parametrize('template, run_argv, command', [
+    ('s5cmd cp {file} s3://bucket/', ['s5cmd', 'run'], ['cp', '{file}', 's3://bucket/']),
+    ('s5cmd --endpoint-url http://localhost:9000 rm s3://bucket/{filename}',
+     ['s5cmd', '--endpoint-url', 'http://localhost:9000', 'run'], ['rm', 's3://bucket/{filename}']),
+    ('/usr/local/bin/s5cmd mv {file} s3://bucket/',
+     ['/usr/local/bin/s5cmd', 'run'], ['mv', '{file}', 's3://bucket/']),
+])
+def test_s5cmd_from_template(template: str, run_argv: list, command: list) -> None:
+    backend = S5cmdBackend.from_template(template)
+
+    assert backend is not None
+    assert (backend.run_argv, backend.command) == (run_argv, command)
+
+
+@pytest.mark.parametrize('template', [
+    's5cmd cat s3://bucket/{filename}',
+    's5cmd ls s3://bucket/',
+    's5cmd --json cp {file} s3://bucket/',
+    's5cmd --log error cp {file} s3://bucket/',
+    's5cmd cp -n {file} s3://bucket/',
+    's5cmd cp --show-progress {file} s3://bucket/',
+    's5cmd cp {file} s3://bucket/ | tee log',
+    'aws s3 cp {file} s3://bucket/',
+])
+def test_s5cmd_from_template_rejects(template: str) -> None:
+    assert S5cmdBackend.from_template(template) is None
+
+
+@pytest.mark.parametrize('io_backend', ['subprocess', 'native'])
+def test_s5cmd_backend_is_opt_in(tmp_path: Path, io_backend: str) -> None:
+    runner, _ = make_runner(tmp_path, 's5cmd cp {file} s3://bucket/', io_backend=io_backend)
+
+    assert isinstance(runner.backends.get('put'), S5cmdBackend) is (io_backend == 'native')
+
+
+# Stands in for `s5cmd run`: echoes each command, or fails, exits or hangs on request
+S5CMD_STUB = """#!{python}
+import shlex, sys, time
+for line in sys.stdin:
+    name = shlex.split(line)[1]
+    if name == 'fail.bin':
+        print('ERROR "cp fail.bin": failed', flush=True)
+    elif name == 'die.bin':
+        sys.exit(3)
+    elif name == 'hang.bin':
+        time.sleep(30)
+    else:
+        print(line.strip(), flush=True)
+"""
+
+
+@pytest.fixture
+def s5cmd(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[S5cmdBackend]:
+    bin_dir = tmp_path / 'bin'
+    bin_dir.mkdir()
+    stub = bin_dir / 's5cmd'
+    stub.write_text(S5CMD_STUB.format(python=sys.executable))
+    stub.chmod(0o755)
+    monkeypatch.setenv('PATH', f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+
+    backend = S5cmdBackend.from_template('s5cmd cp {filename} s3://bucket/')
+    assert backend is not None
+    yield backend
+    backend.close()
+
+
+def test_s5cmd_reuses_process_per_command(s5cmd: S5cmdBackend) -> None:
+    assert s5cmd.execute('put', '/data/a.bin', 'a.bin')[0]
+    assert s5cmd.execute('put', '/data/b.bin', 'b.bin')[0]
+    assert len(s5cmd._procs) == 1
+
+    success, error = s5cmd.execute('put', '/data/fail.bin', 'fail.bin')[:2]
+    assert not success and error.startswith('ERROR')
+    assert s5cmd.execute('put', '/data/c.bin', 'c.bin')[0]
+    assert len(s5cmd._procs) == 1
+
+
+def test_s5cmd_retires_dead_process(s5cmd: S5cmdBackend) -> None:
+    success, error = s5cmd.execute('put', '/data/die.bin', 'die.bin')[:2]
+    assert not success and error == 's5cmd exited with code 3'
+
+    # The next operation gets a fresh process
+    assert s5cmd.execute('put', '/data/a.bin', 'a.bin')[0]
+    assert len(s5cmd._procs) == 2
+
+
+def test_s5cmd_kills_process_on_timeout(s5cmd: S5cmdBackend,
+                                        monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(S5cmdBackend, 'TIMEOUT', 0.2)
+    success, error = s5cmd.execute('put', '/data/hang.bin', 'hang.bin')[:2]
+
+    assert not success and 'no result' in error
+    assert s5cmd._procs[0].wait(timeout=5) == -signal.SIGKILL
+    assert s5cmd.execute('put', '/data/a.bin', 'a.bin')[0]